@@ -8,6 +8,12 @@ import re
 import string
 import time
 import html
+import contextlib
+import hashlib
+import math
+import itertools
+import queue
+import logging.handlers
 
 MARKDOWN_PATTERN = re.compile(
     r"`(?P<code>[^`]+)`|\[(?P<text>[^\]]+)\]\((?P<url>[^)]+)\)", re.DOTALL
@@ -37,8 +43,9 @@ from collections import Counter, defaultdict
 from urllib.parse import urlparse, parse_qs
 
 import aiohttp
+import orjson
 import discord
-from playwright.async_api import async_playwright, Browser
+from playwright.async_api import async_playwright, Browser, BrowserContext
 from nio import (
     AsyncClient,
     LoginResponse,
@@ -54,6 +61,8 @@ CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
 STATS_FILE = os.path.join(BASE_DIR, "char_stats.json")
 DOMAIN_STATS_FILE = os.path.join(BASE_DIR, "domain_stats.json")
 PATTERN_STATS_FILE = os.path.join(BASE_DIR, "pattern_stats.json")
+# Append-only log of successful codes recorded since the last stats snapshot.
+STATS_LOG_FILE = os.path.join(BASE_DIR, "char_stats.log")
 
 if not os.path.exists(CONFIG_FILE):
     raise RuntimeError(f"Missing {CONFIG_FILE}. See config.example.json")
@@ -101,6 +110,10 @@ DOMAIN_WEIGHTS = {domain: cfg.get("weight", 1.0) for domain, cfg in DOMAINS.item
 WEIGHT_INCREASE = 0.1  # Applied when a link is valid
 WEIGHT_DECREASE = 0.01  # Applied when a link is invalid
 MAX_DOMAIN_WEIGHT = 5.0
+# Cumulative weights used by choose_domain, rebuilt when a weight changes
+domain_weights_dirty = True
+_domain_choices: list[str] = []
+_domain_cum_weights: list[float] = []
 COOLDOWN_BASE_SECONDS = 30.0
 COOLDOWN_MAX_SECONDS = 10 * 60.0
 WAF_STATUS_CODES = {403, 429, 503, 520, 521, 522, 524}
@@ -118,6 +131,44 @@ WAF_MARKERS = (
     "captcha",
     "waf",
 )
+# Response bodies are scanned as raw bytes with precompiled, case-insensitive
+# patterns so they never need to be decoded and lowercased first.
+WAF_MARKER_RE = re.compile(
+    b"|".join(re.escape(marker.encode()) for marker in WAF_MARKERS), re.IGNORECASE
+)
+CLOUDFLARE_RE = re.compile(rb"cloudflare", re.IGNORECASE)
+CLOUDFLARE_BLOCK_RE = re.compile(
+    rb"you have been blocked|attention required|access denied"
+    rb"|checking if the site connection is secure|verifying you are human",
+    re.IGNORECASE,
+)
+REDDIT_UNAVAILABLE_RE = re.compile(
+    rb"this page is no longer available"
+    rb"|this is not the web page you are looking for"
+    rb"|this subreddit was banned|this community has been banned"
+    rb"|this subreddit has been banned|this community is private"
+    rb"|you must be 18\+ to view this community",
+    re.IGNORECASE,
+)
+REDDIT_DELETED_BY_USER_RE = re.compile(rb"\[deleted by user\]", re.IGNORECASE)
+# A deleted author is only indicated when all of these appear together
+REDDIT_DELETED_USER_RES = tuple(
+    re.compile(re.escape(marker), re.IGNORECASE)
+    for marker in (b"faceplate-tracker", b"post_credit_bar", b"user_profile", b">[deleted]</div>")
+)
+YOUTUBE_UNAVAILABLE_RE = re.compile(
+    rb"promo-title style-scope ytd-background-promo-renderer"
+    rb"|This video isn't available anymore|This video isn&#39;t available anymore"
+    rb"|Video unavailable"
+)
+# Any marker check_text_page reacts to; used to stop streaming a body early
+TEXT_PAGE_MARKER_RE = re.compile(
+    b"|".join(
+        p.pattern for p in (WAF_MARKER_RE, REDDIT_UNAVAILABLE_RE, REDDIT_DELETED_BY_USER_RE)
+    ),
+    re.IGNORECASE,
+)
+OG_IMAGE_RE = re.compile(rb'<meta property="og:image" content="([^"]+)"')
 
 # Domains that host text rather than images. For these we simply verify that a
 # page exists and send the link without attempting to embed an image.
@@ -137,9 +188,204 @@ SHORTENER_DOMAINS = {
 # rather than downloading the page contents.
 YOUTUBE_HOSTS = {"youtu.be", "youtube.com", "www.youtube.com"}
 
+# Resource types aborted on Playwright pages that are only inspected for their
+# DOM, which never need images, styles or fonts. Pages we screenshot are left
+# unrouted: routing sends every request through Python and disables the
+# browser's HTTP cache, which costs more than skipping media saves.
+DOM_ONLY_BLOCKED_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Markers identifying "not found" pages rendered by image hosts, paired with
+# the reason that is logged. Titles are matched against ``page.title()`` so
+# markup inside the <title> tag cannot hide them; body markers are matched
+# against ``page.content()``. Both are fetched in one gather.
+NOT_FOUND_TITLE_CONTAINS = (
+    ("Gyazo - Not Found", "Gyazo title"),
+)
+NOT_FOUND_TITLE_PREFIXES = (
+    ("That page doesn't exist", "imgbb title"),
+    ("Zight \u2014 Not Found", "cl.ly title"),
+)
+NOT_FOUND_BODY_MARKERS = (
+    ("That puush could not be found.", "Puu.sh body"),
+)
+
+
+async def block_resources(page, resource_types: frozenset[str]) -> None:
+    """Abort requests for the given resource types made by ``page``.
+
+    Routes are registered on the page rather than the pooled context so pages
+    that are screenshotted keep the context's HTTP cache, and pages are closed
+    after every use so handlers never accumulate.
+    """
+
+    async def handler(route) -> None:
+        if route.request.resource_type in resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handler)
+
+
+# Playwright contexts are shared by all workers. Each browser only renders one
+# screenshot at a time, so contexts are spread over several browsers.
+PLAYWRIGHT_BROWSERS = 2
+CONTEXTS_PER_BROWSER = 4
+CONTEXT_MAX_USES = 50
+
+
+class ContextPool:
+    """Pool of pre-warmed Playwright browser contexts.
+
+    Contexts are checked out with :meth:`acquire` and handed out round-robin
+    across the launched browsers. A context is replaced after ``max_uses``
+    checkouts, or when its browser has crashed, so state never builds up in a
+    single long-lived context.
+    """
+
+    def __init__(
+        self,
+        browsers: int = PLAYWRIGHT_BROWSERS,
+        contexts_per_browser: int = CONTEXTS_PER_BROWSER,
+        max_uses: int = CONTEXT_MAX_USES,
+    ) -> None:
+        self._playwright = None
+        self._browsers: list[Browser | None] = [None] * browsers
+        self._contexts_per_browser = contexts_per_browser
+        self._max_uses = max_uses
+        self._launch_lock = asyncio.Lock()
+        # Entries are (browser index, context or None if not created yet, uses)
+        self._queue: asyncio.Queue[tuple[int, BrowserContext | None, int]] = asyncio.Queue()
+
+    async def start(self) -> None:
+        self._playwright = await async_playwright().start()
+        indexes = [
+            index
+            for _ in range(self._contexts_per_browser)
+            for index in range(len(self._browsers))
+        ]
+        # Contexts are independent, so warm them all at once
+        contexts = await asyncio.gather(
+            *(self._new_context(index) for index in indexes), return_exceptions=True
+        )
+        if all(isinstance(context, BaseException) for context in contexts):
+            # Nothing could launch, so let the caller retry instead of leaving
+            # every checkout to relaunch the browser inline
+            raise RuntimeError(f"Failed to create any browser context: {contexts[0]}")
+        for index, context in zip(indexes, contexts):
+            if isinstance(context, BaseException):
+                logger.warning("Failed to pre-warm browser context: %s", context)
+                context = None
+            self._queue.put_nowait((index, context, 0))
+        logger.info(
+            "Context pool ready: %d browsers x %d contexts",
+            len(self._browsers),
+            self._contexts_per_browser,
+        )
+
+    async def _get_browser(self, index: int) -> Browser:
+        browser = self._browsers[index]
+        if browser is None or not browser.is_connected():
+            async with self._launch_lock:
+                browser = self._browsers[index]
+                if browser is None or not browser.is_connected():
+                    browser = await self._playwright.chromium.launch()
+                    self._browsers[index] = browser
+                    logger.info("Browser launched")
+        return browser
+
+    async def _new_context(self, index: int) -> BrowserContext:
+        browser = await self._get_browser(index)
+        return await browser.new_context(viewport={"width": 1280, "height": 720})
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Check out a context for the duration of the ``async with`` block."""
+        index, context, uses = await self._queue.get()
+        try:
+            if context is None:
+                context = await self._new_context(index)
+        except BaseException:
+            self._queue.put_nowait((index, None, 0))
+            raise
+        try:
+            yield context
+        finally:
+            uses += 1
+            browser = self._browsers[index]
+            if uses < self._max_uses and browser is not None and browser.is_connected():
+                self._queue.put_nowait((index, context, uses))
+            else:
+                # Swap in a fresh context off the caller's path so the next
+                # checkout gets a warm one
+                task = asyncio.create_task(self._replace(index, context))
+                background_tasks.add(task)
+                task.add_done_callback(background_tasks.discard)
+
+    async def _replace(self, index: int, old: BrowserContext) -> None:
+        context = None
+        try:
+            try:
+                await old.close()
+            except Exception as exc:
+                logger.warning("Failed to close browser context: %s", exc)
+            try:
+                context = await self._new_context(index)
+            except Exception as exc:
+                logger.warning("Failed to pre-warm browser context: %s", exc)
+        finally:
+            # Always hand the slot back so a failure can't shrink the pool;
+            # acquire() creates the context lazily if this one is missing
+            self._queue.put_nowait((index, context, 0))
+
+    async def close(self) -> None:
+        for browser in self._browsers:
+            if browser:
+                try:
+                    await asyncio.wait_for(browser.close(), timeout=10)
+                    logger.info("Browser closed")
+                except Exception as exc:
+                    logger.warning("Failed to close browser: %s", exc)
+        self._browsers = [None] * len(self._browsers)
+        if self._playwright:
+            try:
+                await asyncio.wait_for(self._playwright.stop(), timeout=10)
+                logger.info("Playwright stopped")
+            except Exception as exc:
+                logger.warning("Failed to stop Playwright: %s", exc)
+            self._playwright = None
+
+
+def _log_task_exception(task: asyncio.Task) -> None:
+    """Log failures of background tasks that may never be awaited."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background task failed: %s", task.exception())
+
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+background_tasks: set[asyncio.Task] = set()
+
+
+async def _close_page(page, url: str) -> None:
+    try:
+        await page.close()
+    except Exception as exc:
+        logger.warning("Failed to close page for %s: %s", url, exc)
+
+
+def close_page_soon(page, url: str) -> None:
+    """Close ``page`` in the background instead of making the caller wait.
+
+    Contexts are pooled, so pages still need closing, but the caller's result
+    doesn't depend on it and the context can be reused meanwhile.
+    """
+    task = asyncio.create_task(_close_page(page, url))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
 
 async def capture_page_screenshot(
-    browser: Browser, url: str, headers=None
+    pool: ContextPool, url: str, headers=None
 ) -> bytes | None:
     """Return a screenshot of the given page using Playwright.
 
@@ -147,27 +393,31 @@ async def capture_page_screenshot(
     entire scrolled page. A 16:9 viewport is used so the resulting image has a
     consistent aspect ratio.
     """
-    context = await browser.new_context(viewport={"width": 1280, "height": 720})
     try:
-        page = await context.new_page()
-        try:
-            await page.set_extra_http_headers(headers or {})
-            await page.goto(url, timeout=10000, wait_until="domcontentloaded")
-            # Capture only the visible portion of the page
-            return await page.screenshot(full_page=False)
-        finally:
+        async with pool.acquire() as context:
+            page = await context.new_page()
             try:
-                await asyncio.shield(page.close())
-            except Exception as exc:
-                logger.warning("Failed to close screenshot page %s: %s", url, exc)
+                await page.set_extra_http_headers(headers or {})
+                await page.goto(url, timeout=10000, wait_until="domcontentloaded")
+                # Capture only the visible portion of the page
+                return await page.screenshot(full_page=False)
+            finally:
+                close_page_soon(page, url)
     except Exception as exc:
         logger.warning("Failed to capture screenshot for %s: %s", url, exc)
-    finally:
-        await context.close()
     return None
 
 
-logging.basicConfig(level=logging.INFO)
+# Records are handed to a queue and written by a listener thread so that
+# logging never blocks the event loop on console I/O.
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_input = logging.handlers.QueueHandler(log_queue)
+# Only merge the message here; the listener applies the real format
+_log_input.setFormatter(logging.Formatter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_input])
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+log_listener = logging.handlers.QueueListener(log_queue, _log_output)
 logger = logging.getLogger("bot")
 
 intents = discord.Intents.default()
@@ -175,15 +425,136 @@ client = discord.Client(intents=intents)
 
 scrape_tasks: list[asyncio.Task] = []
 matrix_client: AsyncClient | None = None
+context_pool: ContextPool | None = None
+# Shared by all workers so connections and DNS lookups are reused across URLs
+http_session: aiohttp.ClientSession | None = None
+# Found links waiting for discord_sender, as (content, channel.send kwargs)
+DISCORD_QUEUE_SIZE = 256
+discord_queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue(maxsize=DISCORD_QUEUE_SIZE)
+discord_sender_task: asyncio.Task | None = None
 
 # Number of concurrent scraping workers to run. This can be configured in
 # config.json using the "scrape_workers" field and overridden at runtime via the
 # SCRAPE_WORKERS environment variable.
 SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", config.get("scrape_workers", 4)))
 
-tested_urls = set()
-tested_lock = asyncio.Lock()
+class BloomFilter:
+    """Fixed-size Bloom filter of strings.
+
+    Membership tests can return false positives at roughly ``error_rate`` once
+    ``capacity`` items have been added, but never false negatives. Memory use
+    is fixed up front instead of growing with every item like a set.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @staticmethod
+    def _hash(item: str) -> tuple[int, int]:
+        # Double hashing: two 64-bit halves of one digest give every position,
+        # in this filter or any other size
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def _positions(self, h1: int, h2: int) -> list[int]:
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def _has(self, positions: list[int]) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def _set(self, positions: list[int]) -> bool:
+        bits = self._bits
+        present = True
+        for pos in positions:
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                present = False
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        return self._has(self._positions(*self._hash(item)))
+
+    def add(self, item: str) -> bool:
+        """Add ``item``, returning True if it was (probably) already present."""
+        return self._set(self._positions(*self._hash(item)))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ScalableBloomFilter:
+    """Bloom filter that keeps its error rate bounded however many items arrive.
+
+    Once the newest :class:`BloomFilter` reaches capacity a new one ``growth``
+    times larger is appended, each with a tighter error rate so the combined
+    false-positive rate stays below ``error_rate``.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int,
+        error_rate: float,
+        growth: int = 4,
+        tightening: float = 0.9,
+    ) -> None:
+        self.growth = growth
+        self.tightening = tightening
+        self._filters = [BloomFilter(initial_capacity, error_rate * (1 - tightening))]
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = BloomFilter._hash(item)
+        return any(f._has(f._positions(h1, h2)) for f in reversed(self._filters))
+
+    def add(self, item: str) -> bool:
+        """Add ``item``, returning True if it was (probably) already present."""
+        # Hash once, and reuse the newest filter's positions for the insert
+        h1, h2 = BloomFilter._hash(item)
+        current = self._filters[-1]
+        positions = current._positions(h1, h2)
+        if current._has(positions):
+            return True
+        if any(f._has(f._positions(h1, h2)) for f in self._filters[-2::-1]):
+            return True
+        if current.count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * self.growth, current.error_rate * self.tightening
+            )
+            self._filters.append(current)
+            positions = current._positions(h1, h2)
+        current._set(positions)
+        return False
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self._filters)
+
+
+# "domain/code" keys of every code generated so far. A false positive only
+# means a random candidate is skipped, so a Bloom filter (about 24MB to start)
+# stands in for a set that would grow by every code tried, and it grows in
+# large steps instead of losing accuracy once full. Checking and adding happen
+# in one synchronous call, so workers need no lock around it.
+TESTED_CODES_CAPACITY = 10_000_000
+TESTED_CODES_ERROR_RATE = 0.001
+tested_codes = ScalableBloomFilter(TESTED_CODES_CAPACITY, TESTED_CODES_ERROR_RATE)
+# Caps outbound aiohttp requests across all workers. Requests that trigger
+# follow-up requests release their slot first so nested fetches can't deadlock.
+# Playwright work is already bounded by the size of the context pool.
+FETCH_SEM = asyncio.Semaphore(20)
+# Default for requests that don't pass their own timeout
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
 save_lock = asyncio.Lock()
+# Domain weights as last written, so unchanged weights aren't rewritten
+last_saved_domain_weights: dict[str, float] = {}
 domain_rate_locks: dict[str, asyncio.Lock] = {}
 domain_last_request: dict[str, float] = {}
 domain_cooldown_until: dict[str, float] = {}
@@ -299,9 +670,107 @@ async def send_matrix_message(
         except Exception as exc:
             logger.error("Failed to send message to Matrix room %s: %s", room, exc)
 
+async def warm_connections(session: aiohttp.ClientSession) -> None:
+    """Open a connection to every scraped host before the workers start.
+
+    One HEAD request per host fills the DNS cache and leaves a kept-alive TLS
+    connection in the pool, so the first real checks skip that setup.
+    """
+
+    async def warm(domain: str, settings: dict) -> None:
+        base_url = settings["base_url"]
+        # Counts as a request to the domain, so workers keep their spacing
+        await enforce_domain_rate_limit(domain, settings.get("rate_limit", 1.0))
+        try:
+            async with FETCH_SEM, session.head(base_url, allow_redirects=False, timeout=5) as resp:
+                status = resp.status
+        except Exception as exc:
+            logger.debug("Failed to warm connection to %s: %s", base_url, exc)
+            return
+        if domain == "reddit.com" and status in WAF_STATUS_CODES:
+            trigger_domain_cooldown(domain, f"status {status}")
+
+    await asyncio.gather(*(warm(domain, settings) for domain, settings in DOMAINS.items()))
+
+async def queue_discord_message(content: str, **kwargs) -> None:
+    """Queue a message for the Discord channel instead of sending it inline."""
+    if not DISCORD_ENABLED:
+        return
+    # Only waits if the sender has fallen DISCORD_QUEUE_SIZE messages behind
+    await discord_queue.put((content, kwargs))
+
+async def discord_sender() -> None:
+    """Send queued messages to the Discord channel one at a time.
+
+    discord.py waits out the channel's rate limit inside ``send``, so this task
+    absorbs that latency instead of the scrape workers.
+    """
+    while True:
+        content, kwargs = await discord_queue.get()
+        try:
+            channel = client.get_channel(CHANNEL_ID)
+            if channel:
+                await asyncio.wait_for(channel.send(content, **kwargs), timeout=10)
+            else:
+                logger.warning("Could not find Discord channel with ID %s", CHANNEL_ID)
+        except Exception as e:
+            logger.error("Failed to send message to Discord: %s", e)
+        finally:
+            discord_queue.task_done()
+
+def _make_resolver() -> aiohttp.abc.AbstractResolver:
+    """Resolve DNS with aiodns when available instead of getaddrinfo in a thread."""
+    try:
+        return aiohttp.resolver.AsyncResolver()
+    except Exception as exc:
+        logger.warning("aiodns resolver unavailable, using threaded DNS: %s", exc)
+        return aiohttp.resolver.ThreadedResolver()
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use or if it was closed."""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=200,
+                limit_per_host=50,
+                resolver=_make_resolver(),
+                use_dns_cache=True,
+                ttl_dns_cache=600,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True,
+            ),
+            timeout=HTTP_TIMEOUT,
+        )
+    return http_session
+
+async def close_session() -> None:
+    """Close the shared HTTP session if one is open."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
 async def start_scrape_loop() -> None:
     """Ensure scraping workers are running and previous instances are closed."""
-    global scrape_tasks
+    global scrape_tasks, stats_log_task, context_pool
+    if stats_log_task is None or stats_log_task.done():
+        stats_log_task = asyncio.create_task(stats_log_writer())
+    # Only publish the pool once it has started, retrying like the old
+    # per-worker launch loop did, so a failed start is never left in place
+    while context_pool is None:
+        pool = ContextPool()
+        try:
+            await pool.start()
+        except Exception as exc:
+            logger.error("Failed to start Playwright, retrying in 5s: %s", exc)
+            await pool.close()
+            await asyncio.sleep(5)
+            continue
+        context_pool = pool
+    # Open the shared session, and its connections, before workers use it
+    if http_session is None or http_session.closed:
+        await warm_connections(get_session())
     if scrape_tasks:
         logger.info("Cancelling existing scrape_loop tasks")
         for task in scrape_tasks:
@@ -316,15 +785,17 @@ async def start_scrape_loop() -> None:
     logger.info("Starting %d scrape_loop workers", SCRAPE_WORKERS)
     loop = asyncio.get_running_loop()
     for i in range(SCRAPE_WORKERS):
-        task = loop.create_task(scrape_loop(worker_id=i))
+        task = loop.create_task(scrape_loop(context_pool, worker_id=i))
         scrape_tasks.append(task)
 
 
 @client.event
 async def on_ready():
-    global logger
+    global logger, discord_sender_task
     logger = logging.getLogger(str(client.user))
     logger.info("Logged in as %s", client.user)
+    if discord_sender_task is None or discord_sender_task.done():
+        discord_sender_task = asyncio.create_task(discord_sender())
     await start_scrape_loop()
 
 @client.event
@@ -339,9 +810,41 @@ total_category_stats: dict[str, dict[int, Counter]] = defaultdict(lambda: defaul
 SAVE_STATS_EVERY = 50
 SAVE_WEIGHTS_EVERY = 50
 scrape_count = 0
+# Set whenever code_distributions changes so unchanged stats aren't rewritten.
+distributions_dirty = False
+
+# Successful codes are appended to STATS_LOG_FILE as they are found and the
+# log is fsynced at every stats heartbeat; the full JSON snapshots are only
+# rewritten (compacting the log) every STATS_COMPACT_EVERY scrapes.
+STATS_LOG_FLUSH_INTERVAL = 1.0
+STATS_COMPACT_EVERY = 1000
+stats_log_buffer: list[str] = []
+stats_log_task: asyncio.Task | None = None
+# Held while the log is appended to or replaced by a compaction
+stats_log_lock = asyncio.Lock()
+# Each log starts with a header naming its generation, and every snapshot
+# records the generation it already includes, so a crash between writing the
+# snapshots and starting a new log never replays codes twice.
+STATS_LOG_HEADER = "#generation\t"
+stats_log_generation = 1
+distributions_log_generation = 0
+pattern_stats_log_generation = 0
 
 ALL_CHARS = string.ascii_letters + string.digits
 
+# Dedicated generator for code sampling so the hot path doesn't share state
+# with the module-level ``random`` helpers.
+_RNG = random.Random()
+
+# Bumped for a (domain, length) whenever a code is added to its statistics
+_stats_versions: Counter = Counter()
+# Sampling tables built by generate_code for each (domain, length): the stats
+# version and charset they were built for and a (chars, cumulative weights)
+# pair per position. Stale entries are rebuilt on their next use.
+_code_weight_cache: dict[
+    tuple[str, int], tuple[int, str, list[tuple[tuple[str, ...], list[float]]]]
+] = {}
+
 def _char_category(ch: str) -> str:
     if ch.islower():
         return "lower"
@@ -351,41 +854,141 @@ def _char_category(ch: str) -> str:
         return "digit"
     return "other"
 
-def _update_distribution(domain: str, code: str) -> None:
+# Codes are ASCII, so categories are looked up instead of calling str methods
+CHAR_CATEGORY_LUT: dict[str, str] = {chr(i): _char_category(chr(i)) for i in range(128)}
+
+def _get_dist(
+    dist_map: dict[str, dict[int, list[Counter]]], domain: str, length: int
+) -> list[Counter]:
+    """Return the per-position counters for ``domain``/``length``, creating them once."""
+    lengths = dist_map[domain]
+    counters = lengths.get(length)
+    if counters is None:
+        counters = [Counter() for _ in range(length)]
+        lengths[length] = counters
+    return counters
+
+def _update_distribution(
+    domain: str,
+    code: str,
+    log: bool = True,
+    *,
+    chars: bool = True,
+    categories: bool = True,
+) -> None:
+    global distributions_dirty
+    distributions_dirty = True
+    if log:
+        stats_log_buffer.append(f"{domain}\t{code}\n")
     length = len(code)
-    while len(code_distributions[domain][length]) < length:
-        code_distributions[domain][length].append(Counter())
-        position_category_stats[domain][length].append(Counter())
-    for i, char in enumerate(code):
-        code_distributions[domain][length][i][char] += 1
-        category = _char_category(char)
-        position_category_stats[domain][length][i][category] += 1
-        total_category_stats[domain][length][category] += 1
+    _stats_versions[(domain, length)] += 1
+    char_counts = _get_dist(code_distributions, domain, length)
+    category_counts = _get_dist(position_category_stats, domain, length)
+    category_totals = total_category_stats[domain][length]
+    for char, chars_at, categories_at in zip(code, char_counts, category_counts):
+        if chars:
+            chars_at[char] += 1
+        if categories:
+            category = CHAR_CATEGORY_LUT.get(char) or _char_category(char)
+            categories_at[category] += 1
+            category_totals[category] += 1
+
+def _set_domain_weight(domain: str, weight: float) -> None:
+    global domain_weights_dirty
+    if DOMAIN_WEIGHTS.get(domain) != weight:
+        DOMAIN_WEIGHTS[domain] = weight
+        domain_weights_dirty = True
+
 
 def update_domain_weight(domain: str, valid: bool) -> None:
     """Adjust domain weight based on whether a link was valid."""
     if valid:
-        DOMAIN_WEIGHTS[domain] = min(
-            MAX_DOMAIN_WEIGHT, DOMAIN_WEIGHTS[domain] + WEIGHT_INCREASE
+        _set_domain_weight(
+            domain, min(MAX_DOMAIN_WEIGHT, DOMAIN_WEIGHTS[domain] + WEIGHT_INCREASE)
         )
     else:
-        DOMAIN_WEIGHTS[domain] = max(1.0, DOMAIN_WEIGHTS[domain] - WEIGHT_DECREASE)
+        _set_domain_weight(domain, max(1.0, DOMAIN_WEIGHTS[domain] - WEIGHT_DECREASE))
 
 
 def reduce_domain_weight(domain: str, factor: float = 0.5) -> tuple[float, float]:
     """Reduce a domain weight by a factor, returning the old/new values."""
     old = DOMAIN_WEIGHTS.get(domain, 1.0)
     new = max(1.0, old * factor)
-    DOMAIN_WEIGHTS[domain] = new
+    _set_domain_weight(domain, new)
     return old, new
 
 
-def _detect_waf_block(status: int, text_lower: str) -> str | None:
+# Scheme, optional userinfo, then the host up to any port, path, query or fragment
+URL_HOST_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*://(?:[^@/?#]*@)?([^:/?#]*)")
+
+
+def _url_host(url: str) -> str:
+    """Return the lowercased host of an absolute URL, or "" if it has none.
+
+    A single regex match, used on hot paths instead of building a full
+    ``urlparse`` result just to read ``.hostname``.
+    """
+    m = URL_HOST_RE.match(url)
+    return m.group(1).lower() if m else ""
+
+
+def _detect_waf_block(status: int, body: bytes = b"") -> str | None:
     if status in WAF_STATUS_CODES:
         return f"status {status}"
-    for marker in WAF_MARKERS:
-        if marker in text_lower:
-            return f"marker '{marker}'"
+    m = WAF_MARKER_RE.search(body)
+    if m:
+        return f"marker '{m.group().decode().lower()}'"
+    return None
+
+
+# Titles and error markers live near the top of a page, so only this much of a
+# body is downloaded when checking whether it is dead.
+BODY_SCAN_LIMIT = 64 * 1024
+BODY_CHUNK_SIZE = 16 * 1024
+
+
+async def _read_body_head(
+    resp: aiohttp.ClientResponse, stop_re: re.Pattern, limit: int = BODY_SCAN_LIMIT
+) -> bytes:
+    """Read up to ``limit`` bytes of a body, stopping as soon as ``stop_re`` matches."""
+    buf = bytearray()
+    async for chunk in resp.content.iter_chunked(BODY_CHUNK_SIZE):
+        # Rescan a little of the previous chunk so markers split across chunks match
+        start = max(0, len(buf) - 256)
+        buf += chunk
+        if len(buf) >= limit or stop_re.search(buf, start):
+            break
+    return bytes(buf[:limit])
+
+
+# Larger media is skipped rather than buffered in memory
+MAX_MEDIA_BYTES = 20 * 1024 * 1024
+
+
+async def _read_capped(
+    resp: aiohttp.ClientResponse, url: str, limit: int = MAX_MEDIA_BYTES
+) -> bytes | None:
+    """Read a whole body, or return None if it is larger than ``limit`` bytes."""
+    if resp.content_length is not None and resp.content_length > limit:
+        logger.info("Checked %s -> not found (oversized, %d bytes)", url, resp.content_length)
+        return None
+    buf = bytearray()
+    async for chunk in resp.content.iter_any():
+        buf += chunk
+        if len(buf) > limit:
+            logger.info("Checked %s -> not found (oversized)", url)
+            return None
+    return bytes(buf)
+
+
+def _reddit_unavailable_reason(body: bytes) -> str | None:
+    """Return why a Reddit page body shows the post is unavailable, if it does."""
+    if REDDIT_UNAVAILABLE_RE.search(body):
+        return "banned or unavailable"
+    if REDDIT_DELETED_BY_USER_RE.search(body):
+        return "deleted by user"
+    if all(pattern.search(body) for pattern in REDDIT_DELETED_USER_RES):
+        return "deleted user"
     return None
 
 
@@ -424,96 +1027,261 @@ def reset_domain_cooldown(domain: str) -> None:
 
 def choose_domain() -> str:
     """Return a domain based on current weights."""
-    domains = [
-        domain
-        for domain in DOMAIN_WEIGHTS.keys()
-        if get_domain_cooldown_remaining(domain) <= 0
-    ]
-    if not domains:
-        domains = list(DOMAIN_WEIGHTS.keys())
-    weights = [DOMAIN_WEIGHTS[d] for d in domains]
-    return random.choices(domains, weights=weights, k=1)[0]
+    global domain_weights_dirty, _domain_choices, _domain_cum_weights
+    now = time.monotonic()
+    if any(until > now for until in domain_cooldown_until.values()):
+        domains = [
+            domain
+            for domain in DOMAIN_WEIGHTS.keys()
+            if get_domain_cooldown_remaining(domain) <= 0
+        ]
+        if domains:
+            weights = [DOMAIN_WEIGHTS[d] for d in domains]
+            return random.choices(domains, weights=weights, k=1)[0]
+    # Weights change far less often than domains are picked, so reuse the
+    # cumulative table until a weight is updated.
+    if domain_weights_dirty:
+        _domain_choices = list(DOMAIN_WEIGHTS.keys())
+        _domain_cum_weights = list(itertools.accumulate(DOMAIN_WEIGHTS.values()))
+        domain_weights_dirty = False
+    return random.choices(_domain_choices, cum_weights=_domain_cum_weights, k=1)[0]
+
+# Per-domain charset overrides, built once instead of on every generated code
+HEURISTIC_CHARSETS: dict[str, str] = {
+    "tinyurl.com": ALL_CHARS,
+    "is.gd": ALL_CHARS,
+    "bit.ly": ALL_CHARS,
+    "rb.gy": ALL_CHARS,
+    # Reddit post IDs are base36: digits and lowercase letters in any order
+    "reddit.com": string.digits + string.ascii_lowercase,
+    "gotomeet.me": string.digits,
+}
+PRNTSC_SHORT_CHARSET = string.ascii_lowercase
 
 def _apply_heuristics(domain: str, charset: str, length: int) -> str:
-    logger.debug(
-        "Applying heuristics: domain=%s length=%d initial_charset=%s",
-        domain,
-        length,
-        charset,
-    )
-    result = charset
     if domain == "prnt.sc":
-        if length == 6:
-            result = string.ascii_lowercase
-        else:
-            result = string.ascii_letters + string.digits
-    elif domain in {"tinyurl.com", "is.gd", "bit.ly", "rb.gy"}:
-        result = string.ascii_letters + string.digits
-    elif domain == "reddit.com":
-        # Reddit post IDs are base36: digits and lowercase letters in any order
-        result = string.digits + string.ascii_lowercase
-    elif domain == "gotomeet.me":
-        result = string.digits
-    logger.debug("Heuristics result for %s: %s", domain, result)
+        result = PRNTSC_SHORT_CHARSET if length == 6 else ALL_CHARS
+    else:
+        result = HEURISTIC_CHARSETS.get(domain, charset)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Heuristics for %s: length=%d initial_charset=%s result=%s",
+            domain,
+            length,
+            charset,
+            result,
+        )
     return result
 
-def save_distributions() -> None:
-    data = {
+
+def _domain_lengths(settings: dict) -> tuple[int, ...]:
+    length_setting = settings.get("length", 6)
+    if isinstance(length_setting, (list, tuple)):
+        return tuple(length_setting)
+    return (length_setting,)
+
+# Final charset for every configured (domain, length), resolved once at import
+HEURISTIC_TABLE: dict[tuple[str, int], str] = {
+    (domain, length): _apply_heuristics(domain, ALL_CHARS, length)
+    for domain, settings in DOMAINS.items()
+    for length in _domain_lengths(settings)
+}
+
+def _charset_for(domain: str, length: int) -> str:
+    charset = HEURISTIC_TABLE.get((domain, length))
+    if charset is None:
+        charset = _apply_heuristics(domain, ALL_CHARS, length)
+    return charset
+
+def _write_json_file(path: str, data) -> None:
+    """Write ``data`` to ``path`` atomically so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _sync_dir(path: str) -> None:
+    """Make renames inside ``path`` durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _distributions_snapshot(log_generation: int = 0) -> dict:
+    return {
+        "log_generation": log_generation,
         "valid": {
-            d: {str(k): [dict(c) for c in v] for k, v in lv.items()}
+            d: {k: [dict(c) for c in v] for k, v in lv.items()}
             for d, lv in code_distributions.items()
-        }
+        },
     }
+
+def save_distributions() -> None:
+    data = _distributions_snapshot()
     logger.info("Saving statistics to %s", STATS_FILE)
-    with open(STATS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    _write_json_file(STATS_FILE, data)
     logger.info("Saved statistics to %s", STATS_FILE)
 
-def save_pattern_stats() -> None:
-    data = {}
+def _pattern_stats_snapshot(log_generation: int = 0) -> dict:
+    data = {"log_generation": log_generation}
     for domain, lengths in position_category_stats.items():
         domain_data = {}
         for length, positions in lengths.items():
-            domain_data[str(length)] = {
+            domain_data[length] = {
                 "positions": [dict(c) for c in positions],
                 "totals": dict(total_category_stats[domain][length]),
             }
         data[domain] = domain_data
+    return data
+
+def save_pattern_stats() -> None:
+    data = _pattern_stats_snapshot()
     logger.info("Saving pattern statistics to %s", PATTERN_STATS_FILE)
-    with open(PATTERN_STATS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    _write_json_file(PATTERN_STATS_FILE, data)
     logger.info("Saved pattern statistics to %s", PATTERN_STATS_FILE)
 
-def save_domain_stats() -> None:
-    """Persist current domain weights to DOMAIN_STATS_FILE."""
+def save_domain_stats(weights: dict[str, float] | None = None) -> None:
+    """Persist domain weights (current ones by default) to DOMAIN_STATS_FILE."""
     logger.info("Saving domain weights to %s", DOMAIN_STATS_FILE)
-    with open(DOMAIN_STATS_FILE, "w", encoding="utf-8") as f:
-        json.dump(DOMAIN_WEIGHTS, f, indent=2)
+    _write_json_file(DOMAIN_STATS_FILE, DOMAIN_WEIGHTS if weights is None else weights)
     logger.info("Saved domain weights to %s", DOMAIN_STATS_FILE)
 
+async def save_domain_stats_async() -> None:
+    """Save a snapshot of the domain weights on a worker thread if they changed."""
+    global last_saved_domain_weights
+    # Copied on the event loop so workers can keep adjusting weights meanwhile
+    weights = dict(DOMAIN_WEIGHTS)
+    if weights == last_saved_domain_weights:
+        return
+    await asyncio.to_thread(save_domain_stats, weights)
+    last_saved_domain_weights = weights
+
+def _append_stats_log(data: str) -> None:
+    with open(STATS_LOG_FILE, "a", encoding="utf-8") as f:
+        if f.tell() == 0:
+            f.write(f"{STATS_LOG_HEADER}{stats_log_generation}\n")
+        f.write(data)
+
+async def flush_stats_log() -> None:
+    """Append buffered codes to STATS_LOG_FILE on a worker thread."""
+    if not stats_log_buffer:
+        return
+    async with stats_log_lock:
+        # Taken under the lock so a compaction never sees codes that are
+        # neither buffered nor in the log
+        data = "".join(stats_log_buffer)
+        stats_log_buffer.clear()
+        if data:
+            await asyncio.to_thread(_append_stats_log, data)
+
+async def stats_log_writer() -> None:
+    """Periodically flush buffered codes so each write is a small batch."""
+    while True:
+        await asyncio.sleep(STATS_LOG_FLUSH_INTERVAL)
+        try:
+            await flush_stats_log()
+        except Exception as exc:
+            logger.warning("Failed to write %s: %s", STATS_LOG_FILE, exc)
+
+def _sync_stats_log() -> None:
+    """Force everything appended to STATS_LOG_FILE onto disk."""
+    if not os.path.exists(STATS_LOG_FILE):
+        return
+    fd = os.open(STATS_LOG_FILE, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_stats_snapshot(distributions: dict, patterns: dict, next_generation: int) -> None:
+    _write_json_file(STATS_FILE, distributions)
+    _write_json_file(PATTERN_STATS_FILE, patterns)
+    # Everything logged so far is part of the snapshots now, so start an empty
+    # log of the next generation in its place
+    tmp_path = STATS_LOG_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{STATS_LOG_HEADER}{next_generation}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, STATS_LOG_FILE)
+    _sync_dir(BASE_DIR)
+
+async def compact_stats() -> None:
+    """Rewrite the statistics snapshots and start a new append-only log.
+
+    The snapshot is taken on the event loop so workers updating the counters
+    can't mutate it mid-serialization; only the JSON encoding and file writes
+    happen on a worker thread. Codes found meanwhile stay buffered until the
+    new log is in place.
+    """
+    global distributions_dirty, stats_log_generation
+    if not distributions_dirty:
+        return
+    async with stats_log_lock:
+        distributions = _distributions_snapshot(stats_log_generation)
+        patterns = _pattern_stats_snapshot(stats_log_generation)
+        # Buffered codes are already counted in the snapshot
+        stats_log_buffer.clear()
+        distributions_dirty = False
+        logger.info("Compacting statistics into %s and %s", STATS_FILE, PATTERN_STATS_FILE)
+        try:
+            await asyncio.to_thread(
+                _write_stats_snapshot, distributions, patterns, stats_log_generation + 1
+            )
+        except Exception:
+            distributions_dirty = True
+            raise
+        stats_log_generation += 1
+    logger.info("Compacted statistics into %s and %s", STATS_FILE, PATTERN_STATS_FILE)
+
+async def checkpoint_stats(count: int) -> None:
+    """Compact every STATS_COMPACT_EVERY scrapes, otherwise just sync the log.
+
+    ``count`` is the scrape count that triggered the checkpoint; the global may
+    have moved on while the caller waited for ``save_lock``.
+    """
+    if count % STATS_COMPACT_EVERY == 0:
+        await compact_stats()
+        return
+    await flush_stats_log()
+    await asyncio.to_thread(_sync_stats_log)
+
+def _padded_counters(counters: list[dict], length: int) -> list[Counter]:
+    """Build one Counter per position, padding short lists loaded from disk."""
+    result = [Counter(c) for c in counters]
+    result.extend(Counter() for _ in range(length - len(result)))
+    return result
+
 def load_distributions() -> None:
     logger.info("Loading statistics from %s", STATS_FILE)
     if not os.path.exists(STATS_FILE):
         logger.info("Statistics file %s does not exist, creating defaults", STATS_FILE)
         save_distributions()
     try:
-        with open(STATS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        with open(STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+    except orjson.JSONDecodeError:
         logger.warning("Statistics file %s is invalid, resetting", STATS_FILE)
         save_distributions()
-        with open(STATS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+
+    global distributions_log_generation
+    distributions_log_generation = data.get("log_generation", 0)
 
     # Reset existing distributions before loading to avoid exponential growth
     code_distributions.clear()
     position_category_stats.clear()
+    _code_weight_cache.clear()
     total_category_stats.clear()
 
     for domain, lengths in data.get("valid", {}).items():
         for length_str, counters in lengths.items():
             length = int(length_str)
-            code_distributions[domain][length] = [Counter(c) for c in counters]
+            code_distributions[domain][length] = _padded_counters(counters, length)
 
 def load_pattern_stats() -> None:
     logger.info("Loading pattern statistics from %s", PATTERN_STATS_FILE)
@@ -524,21 +1292,25 @@ def load_pattern_stats() -> None:
         )
         save_pattern_stats()
     try:
-        with open(PATTERN_STATS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        with open(PATTERN_STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+    except orjson.JSONDecodeError:
         logger.warning("Pattern stats file %s is invalid, resetting", PATTERN_STATS_FILE)
         save_pattern_stats()
-        with open(PATTERN_STATS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(PATTERN_STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+
+    global pattern_stats_log_generation
+    pattern_stats_log_generation = data.pop("log_generation", 0)
 
     position_category_stats.clear()
     total_category_stats.clear()
+    _code_weight_cache.clear()
 
     for domain, lengths in data.items():
         for length_str, info in lengths.items():
             length = int(length_str)
-            pos_list = [Counter(c) for c in info.get("positions", [])]
+            pos_list = _padded_counters(info.get("positions", []), length)
             position_category_stats[domain][length] = pos_list
             total_category_stats[domain][length] = Counter(info.get("totals", {}))
 
@@ -553,24 +1325,57 @@ def load_domain_stats() -> None:
         return
     logger.info("Loading domain weights from %s", DOMAIN_STATS_FILE)
     try:
-        with open(DOMAIN_STATS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        with open(DOMAIN_STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+    except orjson.JSONDecodeError:
         logger.warning("Domain weights file %s is invalid, resetting", DOMAIN_STATS_FILE)
         save_domain_stats()
         return
     for domain, weight in data.items():
         if domain in DOMAIN_WEIGHTS:
             w = max(1.0, float(weight))
-            DOMAIN_WEIGHTS[domain] = min(MAX_DOMAIN_WEIGHT, w)
+            _set_domain_weight(domain, min(MAX_DOMAIN_WEIGHT, w))
+
+def replay_stats_log() -> None:
+    """Apply codes logged since the last snapshot to the loaded statistics.
+
+    Each snapshot only takes the log's codes if it doesn't already include the
+    log's generation, which happens when a compaction was interrupted before it
+    could start a new log.
+    """
+    global stats_log_generation
+    stats_log_generation = max(distributions_log_generation, pattern_stats_log_generation) + 1
+    if not os.path.exists(STATS_LOG_FILE):
+        return
+    logger.info("Replaying statistics log %s", STATS_LOG_FILE)
+    count = 0
+    with open(STATS_LOG_FILE, "r", encoding="utf-8") as f:
+        first = f.readline()
+        if first.startswith(STATS_LOG_HEADER):
+            stats_log_generation = int(first[len(STATS_LOG_HEADER):])
+            lines = f
+        else:
+            # Logs written before generations were recorded
+            lines = itertools.chain([first], f)
+        chars = distributions_log_generation < stats_log_generation
+        categories = pattern_stats_log_generation < stats_log_generation
+        if not (chars or categories):
+            logger.info("Statistics log %s is already in the snapshots", STATS_LOG_FILE)
+            return
+        for line in lines:
+            domain, sep, code = line.rstrip("\n").partition("\t")
+            if not sep or not code:
+                continue
+            _update_distribution(domain, code, log=False, chars=chars, categories=categories)
+            count += 1
+    logger.info("Replayed %d codes from %s", count, STATS_LOG_FILE)
 
 async def fetch_image(session: aiohttp.ClientSession, url: str, headers=None) -> bytes | None:
     try:
-        async with session.get(url, headers=headers, timeout=10) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10) as resp:
             status = resp.status
-            content_type = resp.headers.get("Content-Type", "")
-            if status == 200 and content_type.startswith("image"):
-                return await resp.read()
+            if status == 200 and resp.content_type.startswith("image"):
+                return await _read_capped(resp, url)
             logger.info("Checked %s -> HTTP %s", url, status)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
@@ -581,11 +1386,13 @@ async def fetch_image(session: aiohttp.ClientSession, url: str, headers=None) ->
 async def fetch_media(session: aiohttp.ClientSession, url: str, headers=None) -> tuple[bytes, str] | None:
     """Fetch any media content and return bytes with its content type."""
     try:
-        async with session.get(url, headers=headers, timeout=15) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=15) as resp:
             status = resp.status
             if status == 200:
-                data = await resp.read()
-                return data, resp.headers.get("Content-Type", "application/octet-stream")
+                data = await _read_capped(resp, url)
+                if data is None:
+                    return None
+                return data, resp.content_type
             logger.info("Checked %s -> HTTP %s", url, status)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
@@ -622,12 +1429,12 @@ def get_youtube_thumbnail_url(video_url: str) -> str | None:
     return None
 
 # --- Additional helpers for prnt.sc scraping taken from neednotapply/Screenshot_Stealer-Matrix ---
-async def prntsc_get_image_url(browser: Browser, url: str) -> str | None:
+async def prntsc_get_image_url(pool: ContextPool, url: str) -> str | None:
     """Load a prnt.sc page with Playwright and extract the screenshot URL."""
-    context = await browser.new_context()
-    try:
+    async with pool.acquire() as context:
         page = await context.new_page()
         try:
+            await block_resources(page, DOM_ONLY_BLOCKED_RESOURCES)
             await page.goto(url)
             try:
                 await page.wait_for_selector("#screenshot-image", timeout=5000)
@@ -642,90 +1449,88 @@ async def prntsc_get_image_url(browser: Browser, url: str) -> str | None:
                     image_url = "https://prnt.sc" + image_url
             return image_url
         finally:
-            try:
-                await page.close()
-            except Exception as exc:
-                logger.warning("Failed to close prnt.sc page %s: %s", url, exc)
-    finally:
-        await context.close()
+            close_page_soon(page, url)
 
-async def prntsc_validate_image_url(session: aiohttp.ClientSession, image_url: str) -> bool:
-    """Return True if the given image URL returns HTTP 200."""
-    try:
-        async with session.head(image_url, timeout=5) as response:
-            valid = response.status == 200
-            if not valid:
-                logger.debug(
-                    "prnt.sc image HEAD check failed %s -> HTTP %s",
-                    image_url,
-                    response.status,
-                )
-            return valid
-    except Exception as exc:
-        logger.debug(
-            "prnt.sc image HEAD request error for %s: %s",
-            image_url,
-            exc,
-        )
-        return False
-
-async def fetch_prntsc_image(browser: Browser, session: aiohttp.ClientSession, url: str, headers=None) -> bytes | None:
-    image_url = await prntsc_get_image_url(browser, url)
+async def fetch_prntsc_image(
+    pool: ContextPool,
+    session: aiohttp.ClientSession,
+    url: str,
+    code: str | None = None,
+    headers=None,
+) -> bytes | None:
+    image_url = await prntsc_get_image_url(pool, url)
     if not image_url:
         logger.info("Checked %s -> not found (missing screenshot)", url)
         return None
 
-    if not await prntsc_validate_image_url(session, image_url):
-        logger.info("Checked %s -> not found (image unavailable)", url)
-        return None
-
+    # A missing image just fails the download, so no separate HEAD check
     return await fetch_image(session, image_url, headers=headers)
 
-async def _inner_fetch_playwright_image(browser: Browser, url: str, headers=None) -> bytes | None:
+async def _inner_fetch_playwright_image(pool: ContextPool, url: str, headers=None) -> bytes | None:
     """Capture a screenshot of ``url`` with Playwright."""
-    context = await browser.new_context(viewport={"width": 1280, "height": 720})
-    try:
+    async with pool.acquire() as context:
         page = await context.new_page()
         try:
             await page.set_extra_http_headers(headers or {})
-            await page.goto(url, timeout=10000, wait_until="domcontentloaded")
-
-            try:
-                await page.click('button:has-text("Continue without supporting us")', timeout=3000)
-            except Exception:
-                pass
-
-            title = await page.title()
-            if "Gyazo - Not Found" in title:
-                logger.info("Checked %s -> not found (Gyazo title)", url)
-                return None
-            if title.startswith("That page doesn't exist"):
-                logger.info("Checked %s -> not found (imgbb title)", url)
-                return None
-            if title.startswith("Zight — Not Found"):
-                logger.info("Checked %s -> not found (cl.ly title)", url)
+            # Resolve as soon as the response headers arrive so error pages can
+            # be rejected without waiting for their DOM to be parsed.
+            response = await page.goto(url, timeout=10000, wait_until="commit")
+            if response is None or response.status >= 400:
+                logger.info(
+                    "Checked %s -> HTTP %s",
+                    url,
+                    response.status if response else "no response",
+                )
                 return None
-            if await page.locator('p.Toast2-description', has_text="The requested page could not be found").count() > 0:
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
+
+            # The not-found checks and the consent dialog lookup are independent,
+            # so issue them together rather than as sequential round trips.
+            consent = page.locator('button:has-text("Continue without supporting us")')
+            toast = page.locator('p.Toast2-description', has_text="The requested page could not be found")
+            title, content, toast_count, consent_count = await asyncio.gather(
+                page.title(),
+                page.content(),
+                toast.count(),
+                consent.count(),
+                return_exceptions=True,
+            )
+            if isinstance(toast_count, int) and toast_count > 0:
                 logger.info("Checked %s -> not found (Imgur toast popup)", url)
                 return None
-            content = await page.content()
-            if "That puush could not be found." in content:
-                logger.info("Checked %s -> not found (Puu.sh body)", url)
-                return None
+            if isinstance(title, BaseException):
+                raise title
+            if isinstance(content, BaseException):
+                raise content
+            for marker, reason in NOT_FOUND_TITLE_CONTAINS:
+                if marker in title:
+                    logger.info("Checked %s -> not found (%s)", url, reason)
+                    return None
+            for prefix, reason in NOT_FOUND_TITLE_PREFIXES:
+                if title.startswith(prefix):
+                    logger.info("Checked %s -> not found (%s)", url, reason)
+                    return None
+            for marker, reason in NOT_FOUND_BODY_MARKERS:
+                if marker in content:
+                    logger.info("Checked %s -> not found (%s)", url, reason)
+                    return None
+
+            # Only a minority of pages show this consent dialog, so click it
+            # only when present instead of blocking on a click timeout.
+            if isinstance(consent_count, int) and consent_count > 0:
+                try:
+                    await consent.first.click(timeout=500)
+                except Exception:
+                    pass
 
             screenshot = await page.screenshot(full_page=False)
             return screenshot
         finally:
-            try:
-                await asyncio.shield(page.close())
-            except Exception as exc:
-                logger.warning("Failed to close page for %s: %s", url, exc)
-    finally:
-        await context.close()
+            close_page_soon(page, url)
 
-async def fetch_playwright_image(browser: Browser, url: str, headers=None) -> bytes | None:
+async def fetch_playwright_image(pool: ContextPool, url: str, headers=None) -> bytes | None:
     try:
-        return await asyncio.wait_for(_inner_fetch_playwright_image(browser, url, headers), timeout=15)
+        return await asyncio.wait_for(_inner_fetch_playwright_image(pool, url, headers), timeout=15)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> timeout (global hard cap)", url)
     except Exception as exc:
@@ -734,27 +1539,28 @@ async def fetch_playwright_image(browser: Browser, url: str, headers=None) -> by
 
 async def fetch_imgur_image(session: aiohttp.ClientSession, url: str, headers=None) -> bytes | None:
     try:
-        async with session.get(url, headers=headers, timeout=10) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10) as resp:
             if resp.status != 200:
                 logger.info("Checked %s -> HTTP %s", url, resp.status)
                 return None
 
-            content_type = resp.headers.get("Content-Type", "")
-            if content_type.startswith("image"):
+            if resp.content_type.startswith("image"):
                 logger.info("Found image %s (direct)", url)
-                return await resp.read()
+                return await _read_capped(resp, url)
 
-            text = await resp.text(errors="ignore")
-            if "The requested page could not be found" in text:
+            body = await resp.read()
+            if b"The requested page could not be found" in body:
                 logger.info("Checked %s -> not found (Imgur text)", url)
                 return None
-            m = re.search(r'<meta property="og:image" content="([^"]+)"', text)
-            if m:
-                image_url = html.unescape(m.group(1))
-                if image_url.startswith("//"):
-                    image_url = "https:" + image_url
-                return await fetch_image(session, image_url, headers=headers)
-            logger.info("Checked %s -> not found (missing og:image)", url)
+            m = OG_IMAGE_RE.search(body)
+            if not m:
+                logger.info("Checked %s -> not found (missing og:image)", url)
+                return None
+            image_url = html.unescape(m.group(1).decode("utf-8", "ignore"))
+        # Fetched after the page response has released its FETCH_SEM slot
+        if image_url.startswith("//"):
+            image_url = "https:" + image_url
+        return await fetch_image(session, image_url, headers=headers)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
@@ -763,7 +1569,7 @@ async def fetch_imgur_image(session: aiohttp.ClientSession, url: str, headers=No
 
 
 async def check_youtube_video(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
@@ -771,15 +1577,10 @@ async def check_youtube_video(
 ) -> bool:
 
     try:
-        async with session.get(url, headers=headers, timeout=10) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10) as resp:
             if resp.status == 200:
-                text = await resp.text(errors="ignore")
-                if (
-                    "promo-title style-scope ytd-background-promo-renderer" in text
-                    or "This video isn't available anymore" in text
-                    or "This video isn&#39;t available anymore" in text
-                    or "Video unavailable" in text
-                ):
+                body = await _read_body_head(resp, YOUTUBE_UNAVAILABLE_RE)
+                if YOUTUBE_UNAVAILABLE_RE.search(body):
                     logger.info("Checked %s -> not found (unavailable)", url)
                     return False
                 return True
@@ -792,102 +1593,82 @@ async def check_youtube_video(
 
 
 async def check_text_page(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
     headers=None,
 ) -> str | None:
     try:
-        async with session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
+            status = resp.status
             final_url = str(resp.url)
-            if urlparse(final_url).hostname == "www.reddit.com":
-                final_url = final_url.replace("https://www.reddit.com", "https://reddit.com", 1)
-            final_host = urlparse(final_url).hostname or ""
-            text = await resp.text(errors="ignore")
-            text_lower = text.lower()
-            block_reason = _detect_waf_block(resp.status, text_lower)
-            if block_reason and final_host.endswith("reddit.com"):
-                trigger_domain_cooldown("reddit.com", block_reason)
-                logger.info("Checked %s -> blocked (cooldown)", url)
+            final_host = resp.url.host or ""
+            body = await _read_body_head(resp, TEXT_PAGE_MARKER_RE)
+        if final_host == "www.reddit.com":
+            final_url = final_url.replace("https://www.reddit.com", "https://reddit.com", 1)
+            final_host = "reddit.com"
+        block_reason = _detect_waf_block(status, body)
+        if block_reason and final_host.endswith("reddit.com"):
+            trigger_domain_cooldown("reddit.com", block_reason)
+            logger.info("Checked %s -> blocked (cooldown)", url)
+            return None
+        if status == 200:
+            reason = _reddit_unavailable_reason(body)
+            if reason:
+                logger.info("Checked %s -> not found (%s)", url, reason)
                 return None
-            if resp.status == 200:
-                if (
-                    "this page is no longer available" in text_lower
-                    or "this is not the web page you are looking for" in text_lower
-                    or "this subreddit was banned" in text_lower
-                    or "this community has been banned" in text_lower
-                    or "this subreddit has been banned" in text_lower
-                    or "this community is private" in text_lower
-                    or "you must be 18+ to view this community" in text_lower
-                ):
-                    logger.info("Checked %s -> not found (banned or unavailable)", url)
-                    return None
 
-                if "post title: [deleted by user]" in text_lower or "[deleted by user]" in text_lower:
-                    logger.info("Checked %s -> not found (deleted by user)", url)
-                    return None
-
-                # Additional check for deleted users indicated by a faceplate tracker element
-                if (
-                    "faceplate-tracker" in text_lower
-                    and "post_credit_bar" in text_lower
-                    and "user_profile" in text_lower
-                    and ">[deleted]</div>" in text_lower
-                ):
-                    logger.info("Checked %s -> not found (deleted user)", url)
-                    return None
+            if final_host.endswith("reddit.com"):
+                json_url = final_url + ".json?raw_json=1"
+                try:
+                    async with FETCH_SEM, session.get(json_url, timeout=10) as jresp:
+                        if jresp.status == 200:
+                            data = orjson.loads(await jresp.read())
+                            post = data[0]["data"]["children"][0]["data"]
+                            title = (post.get("title") or "").strip().lower()
+                            author = (post.get("author") or "").strip().lower()
+                            if title in {"[deleted by user]", "[deleted]", "[removed]"}:
+                                logger.info(
+                                    "Checked %s -> not found (deleted post)",
+                                    url,
+                                )
+                                return None
+                            if author == "[deleted]":
+                                logger.info(
+                                    "Checked %s -> not found (deleted post)",
+                                    url,
+                                )
+                                return None
+                            if post.get("is_self"):
+                                logger.info(
+                                    "Checked %s -> not found (self post)", url
+                                )
+                                return None
 
-                if final_host.endswith("reddit.com"):
-                    json_url = final_url + ".json?raw_json=1"
-                    try:
-                        async with session.get(json_url, timeout=10) as jresp:
-                            if jresp.status == 200:
-                                data = await jresp.json()
-                                post = data[0]["data"]["children"][0]["data"]
-                                title = (post.get("title") or "").strip().lower()
-                                author = (post.get("author") or "").strip().lower()
-                                if title in {"[deleted by user]", "[deleted]", "[removed]"}:
+                            crossposts = post.get("crosspost_parent_list")
+                            if crossposts:
+                                parent = crossposts[0]
+                                if parent.get("is_self"):
                                     logger.info(
-                                        "Checked %s -> not found (deleted post)",
+                                        "Checked %s -> not found (self crosspost)",
                                         url,
                                     )
                                     return None
-                                if author == "[deleted]":
-                                    logger.info(
-                                        "Checked %s -> not found (deleted post)",
-                                        url,
-                                    )
-                                    return None
-                                if post.get("is_self"):
-                                    logger.info(
-                                        "Checked %s -> not found (self post)", url
-                                    )
-                                    return None
-
-                                crossposts = post.get("crosspost_parent_list")
-                                if crossposts:
-                                    parent = crossposts[0]
-                                    if parent.get("is_self"):
-                                        logger.info(
-                                            "Checked %s -> not found (self crosspost)",
-                                            url,
-                                        )
-                                        return None
-                                    post = parent
-
-                                if not (
-                                    post.get("post_hint") in {"image", "hosted:video", "rich:video"}
-                                    or post.get("is_video")
-                                ):
-                                    logger.info("Checked %s -> not found (no media)", url)
-                                    return None
-                    except Exception as exc:
-                        logger.debug(
-                            "Failed to check Reddit post type %s: %s", url, exc
-                        )
-                return final_url
-            logger.info("Checked %s -> HTTP %s", url, resp.status)
+                                post = parent
+
+                            if not (
+                                post.get("post_hint") in {"image", "hosted:video", "rich:video"}
+                                or post.get("is_video")
+                            ):
+                                logger.info("Checked %s -> not found (no media)", url)
+                                return None
+                except Exception as exc:
+                    logger.debug(
+                        "Failed to check Reddit post type %s: %s", url, exc
+                    )
+            return final_url
+        logger.info("Checked %s -> HTTP %s", url, status)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
@@ -896,57 +1677,53 @@ async def check_text_page(
 
 
 async def check_discord_invite(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
     headers=None,
 ) -> str | None:
     """Validate a Discord invite by waiting for the page to fully resolve."""
-    context = await browser.new_context()
     try:
-        page = await context.new_page()
-        try:
-            await page.set_extra_http_headers(headers or {})
-            await page.goto(url, timeout=10000, wait_until="domcontentloaded")
+        async with pool.acquire() as context:
+            page = await context.new_page()
             try:
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            except Exception:
-                pass
-            # Allow additional time for any client-side redirects
-            await page.wait_for_timeout(2000)
-
-            content = await page.content()
-            if (
-                "Discord App Launched" in content
-                or "What should everyone call you?" in content
-                or await page.locator(
-                    'input[placeholder="What should everyone call you?"][maxlength="999"]'
-                ).count()
-                > 0
-            ):
-                return str(page.url)
+                await block_resources(page, DOM_ONLY_BLOCKED_RESOURCES)
+                await page.set_extra_http_headers(headers or {})
+                await page.goto(url, timeout=10000, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=10000)
+                except Exception:
+                    pass
+                # Allow additional time for any client-side redirects
+                await page.wait_for_timeout(2000)
 
-            if "This invite may be expired" in content:
-                logger.info("Checked %s -> not found (invite expired)", url)
-            else:
-                logger.info("Checked %s -> not found (invalid invite)", url)
-        finally:
-            try:
-                await asyncio.shield(page.close())
-            except Exception as exc:
-                logger.warning("Failed to close Discord page %s: %s", url, exc)
+                content = await page.content()
+                if (
+                    "Discord App Launched" in content
+                    or "What should everyone call you?" in content
+                    or await page.locator(
+                        'input[placeholder="What should everyone call you?"][maxlength="999"]'
+                    ).count()
+                    > 0
+                ):
+                    return str(page.url)
+
+                if "This invite may be expired" in content:
+                    logger.info("Checked %s -> not found (invite expired)", url)
+                else:
+                    logger.info("Checked %s -> not found (invalid invite)", url)
+            finally:
+                close_page_soon(page, url)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
         logger.warning("Checked %s -> error: %s", url, exc)
-    finally:
-        await context.close()
     return None
 
 
 async def check_google_meet(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
@@ -954,7 +1731,7 @@ async def check_google_meet(
 ) -> str | None:
     """Validate a Google Meet code by ensuring it doesn't redirect to an unsupported page."""
     try:
-        async with session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
             final_url = str(resp.url)
             if "unsupported?meetingCode" in final_url:
                 logger.info("Checked %s -> not found (unsupported)", url)
@@ -970,62 +1747,65 @@ async def check_google_meet(
 
 
 async def check_gotomeet(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
     headers=None,
 ) -> str | None:
     """Validate a GoToMeeting invite by waiting for the page to fully resolve."""
-    context = await browser.new_context()
     try:
-        page = await context.new_page()
-        try:
-            await page.set_extra_http_headers(headers or {})
-            await page.goto(url, timeout=10000, wait_until="domcontentloaded")
+        async with pool.acquire() as context:
+            page = await context.new_page()
             try:
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            except Exception:
-                pass
-            # Allow additional time for any client-side redirects
-            await page.wait_for_timeout(2000)
+                await block_resources(page, DOM_ONLY_BLOCKED_RESOURCES)
+                await page.set_extra_http_headers(headers or {})
+                await page.goto(url, timeout=10000, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=10000)
+                except Exception:
+                    pass
+                # Allow additional time for any client-side redirects
+                await page.wait_for_timeout(2000)
 
-            if await page.locator('text="Couldn\'t find that meeting"').count() > 0:
-                logger.info("Checked %s -> not found (invalid meeting)", url)
-                return None
+                if await page.locator('text="Couldn\'t find that meeting"').count() > 0:
+                    logger.info("Checked %s -> not found (invalid meeting)", url)
+                    return None
 
-            return str(page.url)
-        finally:
-            try:
-                await asyncio.shield(page.close())
-            except Exception as exc:
-                logger.warning("Failed to close GoToMeeting page %s: %s", url, exc)
+                return str(page.url)
+            finally:
+                close_page_soon(page, url)
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
         logger.warning("Checked %s -> error: %s", url, exc)
-    finally:
-        await context.close()
     return None
 
 
 
 async def fetch_shortener_screenshot(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
     headers=None,
-) -> tuple[str, bytes | None] | None:
-    """Follow the shortener and return the final URL with any embed data."""
+) -> tuple[str, bytes | asyncio.Task | None] | None:
+    """Follow the shortener and return the final URL with any embed data.
+
+    Screenshots of the destination page are captured in a background task that
+    is returned in place of the image bytes, so the caller only waits for it
+    once it actually posts the link.
+    """
+    prntsc_url = None
     try:
-        async with session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
+        async with FETCH_SEM, session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
             if resp.status == 404:
                 logger.info("Checked %s -> HTTP 404", url)
                 return None
-            initial_host = urlparse(url).hostname
+            initial_host = _url_host(url)
             final_url = str(resp.url)
-            final_host = urlparse(final_url).hostname
+            # aiohttp has already parsed the final URL
+            final_host = resp.url.host
             if final_host and initial_host and final_host != initial_host:
                 if initial_host == "rb.gy" and final_url.startswith("https://free-url-shortener.rb.gy/"):
                     logger.info("Checked %s -> not found (homepage redirect)", url)
@@ -1035,36 +1815,31 @@ async def fetch_shortener_screenshot(
                     return final_url, None
 
                 if final_host == "prnt.sc":
-                    image = await fetch_prntsc_image(browser, session, final_url, headers=headers)
-                    if image:
-                        return final_url, image
-                    return None
+                    # Fetched below, once this response has released its FETCH_SEM slot
+                    prntsc_url = final_url
+                else:
+                    if resp.content_type.startswith(("image/", "video/")):
+                        return final_url, None
 
-                content_type = resp.headers.get("Content-Type", "").lower()
-                if content_type.startswith("image/") or content_type.startswith("video/"):
-                    return final_url, None
-
-                text = ""
-                try:
-                    text = await resp.text(errors="ignore")
-                except Exception:
-                    pass
-                lower = text.lower()
-                if (
-                    "cloudflare" in lower
-                    and (
-                        "you have been blocked" in lower
-                        or "attention required" in lower
-                        or "access denied" in lower
-                        or "checking if the site connection is secure" in lower
-                        or "verifying you are human" in lower
+                    body = b""
+                    try:
+                        body = await resp.read()
+                    except Exception:
+                        pass
+                    if CLOUDFLARE_RE.search(body) and CLOUDFLARE_BLOCK_RE.search(body):
+                        logger.info("Checked %s -> not found (blocked page)", url)
+                        return None
+                    screenshot_task = asyncio.create_task(
+                        capture_page_screenshot(pool, final_url, headers=headers)
                     )
-                ):
-                    logger.info("Checked %s -> not found (blocked page)", url)
-                    return None
-                screenshot = await capture_page_screenshot(browser, final_url, headers=headers)
-                return final_url, screenshot
-            logger.info("Checked %s -> HTTP %s", url, resp.status)
+                    screenshot_task.add_done_callback(_log_task_exception)
+                    return final_url, screenshot_task
+            else:
+                logger.info("Checked %s -> HTTP %s", url, resp.status)
+        if prntsc_url:
+            image = await fetch_prntsc_image(pool, session, prntsc_url, headers=headers)
+            if image:
+                return prntsc_url, image
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
@@ -1073,7 +1848,7 @@ async def fetch_shortener_screenshot(
 
 
 async def fetch_reddit_redirect(
-    browser: Browser,
+    pool: ContextPool,
     session: aiohttp.ClientSession,
     url: str,
     code: str,
@@ -1087,136 +1862,127 @@ async def fetch_reddit_redirect(
     redirect URL is returned instead.
     """
     try:
-        async with session.get(url, headers=headers, timeout=10, allow_redirects=True) as resp:
-            final_url = str(resp.url)
-            if urlparse(final_url).hostname == "www.reddit.com":
-                final_url = final_url.replace("https://www.reddit.com", "https://reddit.com", 1)
-
-            text = await resp.text(errors="ignore")
-            text_lower = text.lower()
-            block_reason = _detect_waf_block(resp.status, text_lower)
+        # The post's JSON carries everything the HTML page would show, so it is
+        # requested directly instead of probing the page first.
+        json_url = url + ".json?raw_json=1"
+        async with FETCH_SEM, session.get(json_url, headers=headers, timeout=10, allow_redirects=True) as jresp:
+            status = jresp.status
+            body = await jresp.read()
+        if status != 200:
+            # Banned, private and quarantined posts answer with a JSON reason
+            # instead of the post, which is a normal miss rather than a block.
+            if status in {403, 404}:
+                try:
+                    reason = orjson.loads(body).get("reason")
+                except Exception:
+                    reason = None
+                if reason:
+                    logger.info("Checked %s -> not found (%s)", url, reason)
+                    return None
+            block_reason = _detect_waf_block(status, body)
             if block_reason:
                 trigger_domain_cooldown("reddit.com", block_reason)
                 logger.info("Checked %s -> blocked (cooldown)", url)
                 return None
-            if resp.status != 200:
-                logger.info("Checked %s -> HTTP %s", url, resp.status)
-                return None
-            if (
-                "this page is no longer available" in text_lower
-                or "this is not the web page you are looking for" in text_lower
-                or "this subreddit was banned" in text_lower
-                or "this community has been banned" in text_lower
-                or "this subreddit has been banned" in text_lower
-                or "this community is private" in text_lower
-                or "you must be 18+ to view this community" in text_lower
-            ):
-                logger.info("Checked %s -> not found (banned or unavailable)", url)
-                return None
-
-            if "post title: [deleted by user]" in text_lower or "[deleted by user]" in text_lower:
-                logger.info("Checked %s -> not found (deleted by user)", url)
-                return None
-
-            if (
-                "faceplate-tracker" in text_lower
-                and "post_credit_bar" in text_lower
-                and "user_profile" in text_lower
-                and ">[deleted]</div>" in text_lower
-            ):
-                logger.info("Checked %s -> not found (deleted user)", url)
-                return None
-
-            json_url = final_url + ".json?raw_json=1"
-            try:
-                async with session.get(json_url, timeout=10) as jresp:
-                    if jresp.status != 200:
-                        block_reason = _detect_waf_block(jresp.status, "")
-                        if block_reason:
-                            trigger_domain_cooldown("reddit.com", block_reason)
-                            logger.info("Checked %s -> blocked (cooldown)", url)
-                            return None
-                        logger.info("Checked %s -> HTTP %s (json)", url, jresp.status)
-                        return None
-                    data = await jresp.json()
-            except Exception as exc:
-                logger.debug("Failed to fetch Reddit JSON %s: %s", url, exc)
-                return None
-
-            post = data[0]["data"]["children"][0]["data"]
-            title = (post.get("title") or "").strip().lower()
-            author = (post.get("author") or "").strip().lower()
-            if title in {"[deleted by user]", "[deleted]", "[removed]"}:
-                logger.info("Checked %s -> not found (deleted post)", url)
-                return None
-            if author == "[deleted]":
-                logger.info("Checked %s -> not found (deleted post)", url)
-                return None
-            if post.get("is_self"):
-                logger.info("Checked %s -> not found (self post)", url)
-                return None
-
-            crossposts = post.get("crosspost_parent_list")
-            if crossposts:
-                parent = crossposts[0]
-                if parent.get("is_self"):
-                    logger.info("Checked %s -> not found (self crosspost)", url)
-                    return None
-                post = parent
-
-            if not (
-                post.get("post_hint") in {"image", "hosted:video", "rich:video"}
-                or post.get("is_video")
-                or post.get("is_gallery")
-            ):
-                logger.info("Checked %s -> not found (no media)", url)
+            logger.info("Checked %s -> HTTP %s", url, status)
+            return None
+        try:
+            data = orjson.loads(body)
+        except ValueError:
+            # An HTML interstitial instead of JSON is usually a challenge page
+            block_reason = _detect_waf_block(status, body)
+            if block_reason:
+                trigger_domain_cooldown("reddit.com", block_reason)
+                logger.info("Checked %s -> blocked (cooldown)", url)
+            else:
+                logger.info("Checked %s -> not found (invalid JSON)", url)
+            return None
+
+        post = data[0]["data"]["children"][0]["data"]
+        title = (post.get("title") or "").strip().lower()
+        author = (post.get("author") or "").strip().lower()
+        selftext = (post.get("selftext") or "").strip().lower()
+        if post.get("removed_by_category"):
+            logger.info(
+                "Checked %s -> not found (removed: %s)", url, post["removed_by_category"]
+            )
+            return None
+        if (
+            title in {"[deleted by user]", "[deleted]", "[removed]"}
+            or author == "[deleted]"
+            or selftext in {"[deleted]", "[removed]"}
+        ):
+            logger.info("Checked %s -> not found (deleted post)", url)
+            return None
+        # NSFW posts were previously rejected by the HTML page's 18+ gate
+        if post.get("over_18"):
+            logger.info("Checked %s -> not found (over 18)", url)
+            return None
+        if post.get("is_self"):
+            logger.info("Checked %s -> not found (self post)", url)
+            return None
+
+        crossposts = post.get("crosspost_parent_list")
+        if crossposts:
+            parent = crossposts[0]
+            if parent.get("is_self"):
+                logger.info("Checked %s -> not found (self crosspost)", url)
                 return None
+            post = parent
+
+        if not (
+            post.get("post_hint") in {"image", "hosted:video", "rich:video"}
+            or post.get("is_video")
+            or post.get("is_gallery")
+        ):
+            logger.info("Checked %s -> not found (no media)", url)
+            return None
+
+        reddit_video = (
+            (post.get("secure_media") or {}).get("reddit_video")
+            or (post.get("media") or {}).get("reddit_video")
+            or (post.get("preview") or {}).get("reddit_video_preview")
+        )
 
-            reddit_video = (
-                (post.get("secure_media") or {}).get("reddit_video")
-                or (post.get("media") or {}).get("reddit_video")
-                or (post.get("preview") or {}).get("reddit_video_preview")
+        if reddit_video:
+            video_url = (
+                reddit_video.get("fallback_url")
+                or reddit_video.get("scrubber_media_url")
+                or reddit_video.get("dash_url")
             )
-
-            if reddit_video:
-                video_url = (
-                    reddit_video.get("fallback_url")
-                    or reddit_video.get("scrubber_media_url")
-                    or reddit_video.get("dash_url")
-                )
-                if video_url:
-                    final_video = video_url
-                    try:
-                        async with session.get(
-                            video_url,
-                            allow_redirects=True,
-                            timeout=10,
-                            headers={"Range": "bytes=0-0"},
-                        ) as vresp:
-                            if vresp.status < 400:
-                                final_video = str(vresp.url)
-                    except Exception as exc:
-                        logger.debug(
-                            "Failed to resolve Reddit video %s: %s", video_url, exc
-                        )
-                    return final_video, None
-
-            if post.get("is_gallery"):
-                items = (post.get("gallery_data") or {}).get("items") or []
-                if items:
-                    first_id = items[0].get("media_id")
-                    meta = (post.get("media_metadata") or {}).get(first_id) or {}
-                    img_url = (meta.get("s") or {}).get("u")
-                    if not img_url and meta.get("p"):
-                        img_url = meta["p"][-1].get("u")
-                    if img_url:
-                        return html.unescape(img_url), None
-
-            redirect = post.get("url_overridden_by_dest") or post.get("url")
-            if redirect:
-                if redirect.startswith("/"):
-                    redirect = "https://reddit.com" + redirect
-                return redirect, None
+            if video_url:
+                final_video = video_url
+                try:
+                    # Only the redirect target is needed, so don't request a body
+                    async with FETCH_SEM, session.head(
+                        video_url,
+                        allow_redirects=True,
+                        timeout=10,
+                    ) as vresp:
+                        if vresp.status < 400:
+                            final_video = str(vresp.url)
+                except Exception as exc:
+                    logger.debug(
+                        "Failed to resolve Reddit video %s: %s", video_url, exc
+                    )
+                return final_video, None
+
+        if post.get("is_gallery"):
+            items = (post.get("gallery_data") or {}).get("items") or []
+            if items:
+                first_id = items[0].get("media_id")
+                meta = (post.get("media_metadata") or {}).get(first_id) or {}
+                img_url = (meta.get("s") or {}).get("u")
+                if not img_url and meta.get("p"):
+                    img_url = meta["p"][-1].get("u")
+                if img_url:
+                    return html.unescape(img_url), None
+
+        redirect = post.get("url_overridden_by_dest") or post.get("url")
+        if redirect:
+            if redirect.startswith("/"):
+                redirect = "https://reddit.com" + redirect
+            return redirect, None
     except asyncio.TimeoutError:
         logger.warning("Checked %s -> not found (timeout)", url)
     except Exception as exc:
@@ -1224,7 +1990,7 @@ async def fetch_reddit_redirect(
     return None
 
 SCRAPER_MAP = {
-    "prnt.sc": lambda browser, session, url, code, headers: fetch_prntsc_image(browser, session, url, headers=headers),
+    "prnt.sc": fetch_prntsc_image,
     "tinyurl.com": fetch_shortener_screenshot,
     "is.gd": fetch_shortener_screenshot,
     "bit.ly": fetch_shortener_screenshot,
@@ -1233,346 +1999,247 @@ SCRAPER_MAP = {
     "reddit.com": fetch_reddit_redirect,
 }
 
-async def scrape_loop(worker_id: int = 0):
-    global scrape_count
+async def post_shortener_hit(
+    session: aiohttp.ClientSession,
+    domain: str,
+    url: str,
+    final_url: str,
+    screenshot_data: bytes | asyncio.Task | None,
+) -> None:
+    """Post a found shortener link, waiting for its screenshot if one is pending."""
+    if isinstance(screenshot_data, asyncio.Task):
+        try:
+            screenshot_data = await asyncio.wait_for(screenshot_data, timeout=15)
+        except Exception as exc:
+            logger.warning("Failed to capture screenshot for %s: %s", final_url, exc)
+            screenshot_data = None
+    # Every shortener result is shown as the short URL linking to its target
+    link = f"[{url}]({final_url})"
+    content = link if domain == "reddit.com" else f"`{url}` -> {link}"
+    # Fetched once and shared by the Discord and Matrix posts:
+    # (data, content type, filename)
+    attachment = None
+    if screenshot_data:
+        attachment = (screenshot_data, "image/png", "screenshot.png")
+    elif _url_host(final_url) in YOUTUBE_HOSTS:
+        thumb_url = get_youtube_thumbnail_url(final_url)
+        thumb = await fetch_image(session, thumb_url) if thumb_url else None
+        if thumb:
+            attachment = (thumb, "image/jpeg", "youtube.jpg")
+    else:
+        media = await fetch_media(session, final_url)
+        if media:
+            data, ctype = media
+            ext = _guess_extension(final_url, ctype) or ".bin"
+            attachment = (data, ctype, f"file{ext}")
+
+    if DISCORD_ENABLED:
+        if attachment:
+            data, ctype, filename = attachment
+            file = discord.File(io.BytesIO(data), filename=filename)
+            if ctype.startswith("image"):
+                embed = discord.Embed(url=final_url)
+                embed.set_image(url=f"attachment://{filename}")
+                await queue_discord_message(content, embed=embed, file=file)
+            else:
+                await queue_discord_message(content, file=file)
+        else:
+            await queue_discord_message(content)
+    if attachment:
+        data, ctype, filename = attachment
+        await send_matrix_message(
+            content,
+            data,
+            content_type=ctype,
+            filename=filename,
+        )
+    else:
+        await send_matrix_message(content)
+
+# Shared by all workers so the watchdog logs once a minute overall
+last_watchdog_log = time.time()
+# Consecutive generate_code calls per (domain, length) that found only tested
+# codes; past the limit workers back off briefly instead of spinning on the
+# event loop
+MAX_DUPLICATE_MISSES = 64
+duplicate_misses: Counter[tuple[str, int]] = Counter()
+
+async def _scrape_once(pool: ContextPool, session: aiohttp.ClientSession) -> None:
+    """Pick a domain, test one generated code and report it if found."""
+    global scrape_count, last_watchdog_log
+    domain = choose_domain()
+    cooldown_remaining = get_domain_cooldown_remaining(domain)
+    if cooldown_remaining > 0:
+        logger.warning(
+            "Domain %s is in cooldown for %.1fs, pausing requests",
+            domain,
+            cooldown_remaining,
+        )
+        await asyncio.sleep(cooldown_remaining)
+        return
+    settings = DOMAINS[domain]
+    base_url = settings["base_url"]
+    length_setting = settings.get("length", 6)
+    if isinstance(length_setting, (list, tuple)):
+        length = random.choice(length_setting)
+    else:
+        length = length_setting
+    rate_limit = settings.get("rate_limit", 1.0)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(
+            "Domain selected: %s length=%d rate_limit=%s",
+            domain,
+            length,
+            rate_limit,
+        )
+    charset = _charset_for(domain, length)
+
+    headers = None
+    code = generate_code(domain, length, charset)
+    if code is None:
+        # This domain's code space looks exhausted for now; pick another domain
+        # straight away, only yielding once misses keep piling up
+        duplicate_misses[domain, length] += 1
+        if duplicate_misses[domain, length] >= MAX_DUPLICATE_MISSES:
+            del duplicate_misses[domain, length]
+            await asyncio.sleep(0.01)
+        return
+    duplicate_misses.pop((domain, length), None)
+    if debug:
+        logger.debug("Generated code for %s: %s", domain, code)
+    url = f"{base_url}/{code}"
+
+    await enforce_domain_rate_limit(domain, rate_limit)
+    logger.info("Checking %s", url)
+
+    fetcher = SCRAPER_MAP.get(domain)
+    if not fetcher:
+        return
+
+    try:
+        result = await asyncio.wait_for(
+            fetcher(pool, session, url, code, headers),
+            timeout=15,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Checked %s -> timeout (hard cap exceeded)", url)
+        result = None
+    except Exception as exc:
+        logger.warning("Checked %s -> error: %s", url, exc)
+        result = None
+    else:
+        if debug:
+            logger.debug(
+                "Fetcher completed for %s -> %s",
+                url,
+                "success" if result else "not found",
+            )
+
+    scrape_count += 1
+    count = scrape_count
+
+    if time.time() - last_watchdog_log > 60:
+        logger.info("Watchdog: still alive, %d URLs tested", scrape_count)
+        last_watchdog_log = time.time()
+
+    if count % SAVE_WEIGHTS_EVERY == 0:
+        logger.info(
+            "Heartbeat: processed %d URLs", count
+        )
+        async with save_lock:
+            await checkpoint_stats(count)
+            await save_domain_stats_async()
+    elif count % SAVE_STATS_EVERY == 0:
+        logger.info(
+            "Heartbeat: processed %d URLs", count
+        )
+        async with save_lock:
+            await checkpoint_stats(count)
+
+    if domain in TEXT_DOMAINS:
+        if not result:
+            update_domain_weight(domain, False)
+            return
+        final_url = result
+        logger.info("Found page %s", final_url)
+        _update_distribution(domain, code)
+        update_domain_weight(domain, True)
+        await queue_discord_message(final_url)
+        await send_matrix_message(final_url)
+    elif domain in SHORTENER_DOMAINS:
+        if not result:
+            update_domain_weight(domain, False)
+            return
+        final_url, screenshot_data = result
+        logger.info("Found redirect %s -> %s", url, final_url)
+        _update_distribution(domain, code)
+        update_domain_weight(domain, True)
+        if domain == "reddit.com":
+            reset_domain_cooldown(domain)
+        # Posting waits for the screenshot task, so hand it off and let this
+        # worker move on to the next check
+        task = asyncio.create_task(
+            post_shortener_hit(session, domain, url, final_url, screenshot_data)
+        )
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+        task.add_done_callback(_log_task_exception)
+    else:
+        image_data = result
+        if image_data is None:
+            update_domain_weight(domain, False)
+            return
+
+        logger.info("Found image %s", url)
+        _update_distribution(domain, code)
+        update_domain_weight(domain, True)
+
+        if DISCORD_ENABLED:
+            file = discord.File(io.BytesIO(image_data), filename="image.png")
+            embed = discord.Embed(url=url)
+            embed.set_image(url="attachment://image.png")
+            await queue_discord_message(url, embed=embed, file=file)
+        await send_matrix_message(
+            url,
+            image_data,
+            content_type="image/png",
+            filename="image.png",
+        )
+
+
+async def scrape_loop(pool: ContextPool, worker_id: int = 0):
     logger.info("Worker %d: Starting scrape loop", worker_id)
     while True:
-        browser = None
-        p = None
         try:
-            async with aiohttp.ClientSession() as session:
-                p = await async_playwright().start()
-                try:
-                    browser = await p.chromium.launch()
-                    logger.info("Browser launched")
-                except Exception as exc:
-                    logger.exception("Failed to launch browser: %s", exc)
-                    await p.stop()
-                    p = None
-                    raise
-
-                last_log = time.time()
-                while True:
-                    try:
-                        domain = choose_domain()
-                        cooldown_remaining = get_domain_cooldown_remaining(domain)
-                        if cooldown_remaining > 0:
-                            logger.warning(
-                                "Domain %s is in cooldown for %.1fs, pausing requests",
-                                domain,
-                                cooldown_remaining,
-                            )
-                            await asyncio.sleep(cooldown_remaining)
-                            continue
-                        settings = DOMAINS[domain]
-                        base_url = settings["base_url"]
-                        length_setting = settings.get("length", 6)
-                        if isinstance(length_setting, (list, tuple)):
-                            length = random.choice(length_setting)
-                        else:
-                            length = length_setting
-                        rate_limit = settings.get("rate_limit", 1.0)
-                        logger.debug(
-                            "Domain selected: %s length=%d rate_limit=%s",
-                            domain,
-                            length,
-                            rate_limit,
-                        )
-                        charset = _apply_heuristics(domain, ALL_CHARS, length)
-
-                        headers = None
-                        code = generate_code(domain, length, charset)
-                        logger.debug("Generated code for %s: %s", domain, code)
-                        url = f"{base_url}/{code}"
-                        async with tested_lock:
-                            if url in tested_urls:
-                                await asyncio.sleep(0)
-                                continue
-                            tested_urls.add(url)
-
-                        await enforce_domain_rate_limit(domain, rate_limit)
-                        logger.info("Checking %s", url)
-
-                        fetcher = SCRAPER_MAP.get(domain)
-                        if not fetcher:
-                            await asyncio.sleep(rate_limit)
-                            continue
-
-                        try:
-                            result = await asyncio.wait_for(
-                                fetcher(browser, session, url, code, headers),
-                                timeout=15,
-                            )
-                        except asyncio.TimeoutError:
-                            logger.warning("Checked %s -> timeout (hard cap exceeded)", url)
-                            result = None
-                        except Exception as exc:
-                            logger.warning("Checked %s -> error: %s", url, exc)
-                            result = None
-                        else:
-                            logger.debug(
-                                "Fetcher completed for %s -> %s",
-                                url,
-                                "success" if result else "not found",
-                            )
-
-                        scrape_count += 1
-
-                        if time.time() - last_log > 60:
-                            logger.info("Watchdog: still alive, %d URLs tested", scrape_count)
-                            last_log = time.time()
-
-                        if scrape_count % SAVE_WEIGHTS_EVERY == 0:
-                            logger.info(
-                                "Heartbeat: processed %d URLs", scrape_count
-                            )
-                            async with save_lock:
-                                save_distributions()
-                                save_pattern_stats()
-                                load_distributions()
-                                load_pattern_stats()
-                                save_domain_stats()
-                                load_domain_stats()
-                        elif scrape_count % SAVE_STATS_EVERY == 0:
-                            logger.info(
-                                "Heartbeat: processed %d URLs", scrape_count
-                            )
-                            async with save_lock:
-                                save_distributions()
-                                save_pattern_stats()
-                                load_distributions()
-                                load_pattern_stats()
-
-                        if domain in TEXT_DOMAINS:
-                            if not result:
-                                update_domain_weight(domain, False)
-                                await asyncio.sleep(rate_limit)
-                                continue
-                            final_url = result
-                            logger.info("Found page %s", final_url)
-                            _update_distribution(domain, code)
-                            update_domain_weight(domain, True)
-                            channel = client.get_channel(CHANNEL_ID) if DISCORD_ENABLED else None
-                            if channel:
-                                try:
-                                    await asyncio.wait_for(
-                                        channel.send(final_url),
-                                        timeout=10,
-                                    )
-                                except Exception as e:
-                                    logger.error("Failed to send message to Discord: %s", e)
-                            elif DISCORD_ENABLED:
-                                logger.warning("Could not find Discord channel with ID %s", CHANNEL_ID)
-                            await send_matrix_message(final_url)
-                        elif domain in SHORTENER_DOMAINS:
-                            if not result:
-                                update_domain_weight(domain, False)
-                                await asyncio.sleep(rate_limit)
-                                continue
-                            final_url, screenshot_data = result
-                            logger.info("Found redirect %s -> %s", url, final_url)
-                            _update_distribution(domain, code)
-                            update_domain_weight(domain, True)
-                            if domain == "reddit.com":
-                                reset_domain_cooldown(domain)
-                            channel = client.get_channel(CHANNEL_ID) if DISCORD_ENABLED else None
-                            if channel:
-                                try:
-                                    if screenshot_data:
-                                        file = discord.File(io.BytesIO(screenshot_data), filename="screenshot.png")
-                                        embed = discord.Embed()
-                                        embed.set_image(url="attachment://screenshot.png")
-                                        final_host = urlparse(final_url).hostname or final_url
-                                        if final_host.startswith("www."):
-                                            final_host = final_host[4:]
-                                        embed.url = final_url
-                                        display_text = url if domain in SHORTENER_DOMAINS else final_host
-                                        link = f"[{display_text}]({final_url})"
-                                        content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                                        await asyncio.wait_for(
-                                            channel.send(content, embed=embed, file=file),
-                                            timeout=10,
-                                        )
-                                    else:
-                                        final_host = urlparse(final_url).hostname or ""
-                                        is_youtube = final_host in YOUTUBE_HOSTS
-                                        if is_youtube:
-                                            thumb = None
-                                            thumb_url = get_youtube_thumbnail_url(final_url)
-                                            if thumb_url:
-                                                thumb = await fetch_image(session, thumb_url)
-                                            if thumb:
-                                                file = discord.File(io.BytesIO(thumb), filename="youtube.jpg")
-                                                embed = discord.Embed(url=final_url)
-                                                embed.set_image(url="attachment://youtube.jpg")
-                                                display_text = url
-                                                link = f"[{display_text}]({final_url})"
-                                                content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                                                await asyncio.wait_for(
-                                                    channel.send(content, embed=embed, file=file),
-                                                    timeout=10,
-                                                )
-                                            else:
-                                                display_text = url
-                                                link = f"[{display_text}]({final_url})"
-                                                content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                                                await asyncio.wait_for(
-                                                    channel.send(content),
-                                                    timeout=10,
-                                                )
-                                        else:
-                                            media = await fetch_media(session, final_url)
-                                            if media:
-                                                data, ctype = media
-                                                ext = _guess_extension(final_url, ctype) or ".bin"
-                                                filename = f"file{ext}"
-                                                file = discord.File(io.BytesIO(data), filename=filename)
-                                                if domain in SHORTENER_DOMAINS:
-                                                    display_text = url
-                                                else:
-                                                    display_text = urlparse(final_url).hostname or final_url
-                                                    if display_text.startswith("www."):
-                                                        display_text = display_text[4:]
-                                                link = f"[{display_text}]({final_url})"
-                                                content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                                                if ctype.startswith("image"):
-                                                    embed = discord.Embed(url=final_url)
-                                                    embed.set_image(url=f"attachment://{filename}")
-                                                    await asyncio.wait_for(
-                                                        channel.send(content, embed=embed, file=file),
-                                                        timeout=10,
-                                                    )
-                                                else:
-                                                    await asyncio.wait_for(
-                                                        channel.send(content, file=file),
-                                                        timeout=10,
-                                                    )
-                                            else:
-                                                if domain in SHORTENER_DOMAINS:
-                                                    display_text = url
-                                                else:
-                                                    display_text = urlparse(final_url).hostname or final_url
-                                                    if display_text.startswith("www."):
-                                                        display_text = display_text[4:]
-                                                link = f"[{display_text}]({final_url})"
-                                                content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                                                await asyncio.wait_for(
-                                                    channel.send(content),
-                                                    timeout=10,
-                                                )
-                                except Exception as e:
-                                    logger.error("Failed to send message to Discord: %s", e)
-                            elif DISCORD_ENABLED:
-                                logger.warning("Could not find Discord channel with ID %s", CHANNEL_ID)
-                            if domain in SHORTENER_DOMAINS:
-                                display_text = url
-                            else:
-                                display_text = urlparse(final_url).hostname or final_url
-                                if display_text.startswith("www."):
-                                    display_text = display_text[4:]
-                            link = f"[{display_text}]({final_url})"
-                            content = link if domain == "reddit.com" else f"`{url}` -> {link}"
-                            if screenshot_data:
-                                await send_matrix_message(
-                                    content,
-                                    screenshot_data,
-                                    content_type="image/png",
-                                    filename="screenshot.png",
-                                )
-                            else:
-                                final_host = urlparse(final_url).hostname or ""
-                                is_youtube = final_host in YOUTUBE_HOSTS
-                                if is_youtube:
-                                    thumb_data = None
-                                    thumb_url = get_youtube_thumbnail_url(final_url)
-                                    if thumb_url:
-                                        thumb_data = await fetch_image(session, thumb_url)
-                                    if thumb_data:
-                                        await send_matrix_message(
-                                            content,
-                                            thumb_data,
-                                            content_type="image/jpeg",
-                                            filename="youtube.jpg",
-                                        )
-                                    else:
-                                        await send_matrix_message(content)
-                                else:
-                                    media = await fetch_media(session, final_url)
-                                    if media:
-                                        data, ctype = media
-                                        ext = _guess_extension(final_url, ctype) or ".bin"
-                                        await send_matrix_message(
-                                            content,
-                                            data,
-                                            content_type=ctype,
-                                            filename=f"file{ext}",
-                                        )
-                                    else:
-                                        await send_matrix_message(content)
-                        else:
-                            image_data = result
-                            if image_data is None:
-                                update_domain_weight(domain, False)
-                                await asyncio.sleep(rate_limit)
-                                continue
-
-                            logger.info("Found image %s", url)
-                            _update_distribution(domain, code)
-                            update_domain_weight(domain, True)
-
-                            channel = client.get_channel(CHANNEL_ID) if DISCORD_ENABLED else None
-                            if channel:
-                                try:
-                                    file = discord.File(io.BytesIO(image_data), filename="image.png")
-                                    embed = discord.Embed(url=url)
-                                    embed.set_image(url="attachment://image.png")
-                                    await asyncio.wait_for(
-                                        channel.send(url, embed=embed, file=file),
-                                        timeout=10,
-                                    )
-                                except Exception as e:
-                                    logger.error("Failed to send message to Discord: %s", e)
-                            elif DISCORD_ENABLED:
-                                logger.warning("Could not find Discord channel with ID %s", CHANNEL_ID)
-                            await send_matrix_message(
-                                url,
-                                image_data,
-                                content_type="image/png",
-                                filename="image.png",
-                            )
-
-                        await asyncio.sleep(rate_limit)
-                    except Exception:
-                        logger.exception("Error in scrape_loop iteration")
-                        await asyncio.sleep(5)
+            await _scrape_once(pool, get_session())
         except asyncio.CancelledError:
             logger.info("scrape_loop cancelled")
             break
         except Exception:
-            logger.exception("scrape_loop error - restarting in 5s")
+            logger.exception("Error in scrape_loop iteration")
             await asyncio.sleep(5)
-        finally:
-            if browser:
-                try:
-                    await asyncio.wait_for(browser.close(), timeout=10)
-                    logger.info("Browser closed")
-                except Exception as exc:
-                    logger.warning("Failed to close browser: %s", exc)
-                browser = None
-            if p:
-                try:
-                    await asyncio.wait_for(p.stop(), timeout=10)
-                    logger.info("Playwright stopped")
-                except Exception as exc:
-                    logger.warning("Failed to stop Playwright: %s", exc)
-                p = None
     logger.warning("scrape_loop exited")
 
-def generate_code(domain: str, length: int, charset: str) -> str:
-    """Generate a code biased by collected statistics but still random."""
-    dist = code_distributions.get(domain, {}).get(length)
-    pattern = position_category_stats.get(domain, {}).get(length)
-    result = []
+# Uniformly random codes are drawn in batches so the RNG call overhead is paid
+# once per COLD_CODE_BATCH codes instead of once per code.
+COLD_CODE_BATCH = 1024
+_cold_codes: dict[tuple[str, int], list[str]] = {}
+
+def _cold_code(charset: str, length: int) -> str:
+    """Pop a pregenerated uniformly random code, refilling the batch when empty."""
+    codes = _cold_codes.get((charset, length))
+    if not codes:
+        chars = "".join(_RNG.choices(charset, k=length * COLD_CODE_BATCH))
+        codes = [chars[i:i + length] for i in range(0, len(chars), length)]
+        _cold_codes[(charset, length)] = codes
+    return codes.pop()
+
+def _position_weights(
+    dist: list[Counter] | None, pattern: list[Counter] | None, length: int, charset: str
+) -> list[tuple[tuple[str, ...], list[float]]]:
+    """Build the per-position sampling table used by generate_code."""
+    tables = []
     for i in range(length):
         weight_map = {ch: 1 for ch in charset}
         if dist and i < len(dist):
@@ -1583,23 +2250,78 @@ def generate_code(domain: str, length: int, charset: str) -> str:
             total = sum(counter.values())
             if total:
                 for ch in weight_map:
-                    cat = _char_category(ch)
+                    cat = CHAR_CATEGORY_LUT.get(ch) or _char_category(ch)
                     weight_map[ch] *= 1 + counter.get(cat, 0) / total
         chars, weights = zip(*weight_map.items())
-        result.append(random.choices(chars, weights=weights, k=1)[0])
-    return "".join(result)
+        tables.append((chars, list(itertools.accumulate(weights))))
+    return tables
 
-async def main() -> None:
-    load_distributions()
-    load_pattern_stats()
-    load_domain_stats()
-    if MATRIX_ENABLED:
-        await start_matrix_client()
-    if DISCORD_ENABLED:
-        await client.start(TOKEN)
+# Candidates drawn per generate_code call before giving up on a domain
+MAX_CODE_ATTEMPTS = 16
+
+def generate_code(domain: str, length: int, charset: str) -> str | None:
+    """Generate a code for ``domain`` that hasn't been tried yet.
+
+    Duplicates are rejected here so the scrape loop never builds a request for
+    them. Returns None if every candidate drawn was already tested.
+    """
+    for _ in range(MAX_CODE_ATTEMPTS):
+        code = _sample_code(domain, length, charset)
+        if not tested_codes.add(f"{domain}/{code}"):
+            return code
+    return None
+
+def _sample_code(domain: str, length: int, charset: str) -> str:
+    """Generate a code biased by collected statistics but still random."""
+    dist = code_distributions.get(domain, {}).get(length)
+    pattern = position_category_stats.get(domain, {}).get(length)
+    if not dist and not pattern:
+        return _cold_code(charset, length)
+    # Statistics only change when a code is found, so the weights are rebuilt
+    # then rather than for every generated code.
+    key = (domain, length)
+    version = _stats_versions[key]
+    cached = _code_weight_cache.get(key)
+    if cached is None or cached[0] != version or cached[1] != charset:
+        tables = _position_weights(dist, pattern, length, charset)
+        _code_weight_cache[key] = (version, charset, tables)
     else:
-        await start_scrape_loop()
-        await asyncio.Event().wait()
+        tables = cached[2]
+    return "".join(
+        _RNG.choices(chars, cum_weights=cum_weights, k=1)[0]
+        for chars, cum_weights in tables
+    )
+
+async def main() -> None:
+    log_listener.start()
+    try:
+        # Statistics files can grow large, so read them on a worker thread
+        # rather than stalling the event loop during startup.
+        await asyncio.to_thread(load_distributions)
+        await asyncio.to_thread(load_pattern_stats)
+        await asyncio.to_thread(load_domain_stats)
+        await asyncio.to_thread(replay_stats_log)
+        if MATRIX_ENABLED:
+            await start_matrix_client()
+        if DISCORD_ENABLED:
+            await client.start(TOKEN)
+        else:
+            await start_scrape_loop()
+            await asyncio.Event().wait()
+    finally:
+        # Stop everything that uses the pool, the session or the stats log
+        # before closing them, so nothing reopens the session or finds a code
+        # after the last flush
+        tasks = [*scrape_tasks, stats_log_task, discord_sender_task]
+        tasks = [task for task in tasks if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await flush_stats_log()
+        if context_pool:
+            await context_pool.close()
+        await close_session()
+        log_listener.stop()
 
 
 if __name__ == "__main__":